@@ -24,6 +24,7 @@
 import * as vscode from "vscode";
 import { promises as fs } from "fs";
 import * as path from "path";
+import * as crypto from "crypto";
 
 // ─── interfaces and types ──────────────────────────────────────────────
 interface FileItem {
@@ -457,7 +458,23 @@ interface ChunkInfo {
   hash: string;
 }
 
-function validateChunk(content: string, filePath: string, index: number, configuredMaxChunkSize: number): ChunkValidationResult {
+// Heuristics for "this chunk contains code", compiled once at load time.
+// A whole chunk is scanned in one pass: (?<![^\n]) anchors at the start of the
+// text or after "\n" only (unlike ^ with the m flag, which also matches after
+// "\r"), and [^\S\n] is whitespace that stays on the current line.
+const CODE_ASSIGNMENT_PATTERN = /(?<![^\n])[^\S\n]*[a-zA-Z_$][\w$]*[^\S\n]*[=:({]/;
+const CODE_KEYWORD_PATTERN = /(?<![^\n])[^\S\n]*(import|from|class|def|function|const|let|var)[^\S\n]/;
+
+// Same result as text.split('\n').length without allocating the lines
+function countLines(text: string): number {
+  let count = 1;
+  for (let i = text.indexOf('\n'); i !== -1; i = text.indexOf('\n', i + 1)) {
+    count++;
+  }
+  return count;
+}
+
+function validateChunk(content: string, language: string, index: number, configuredMaxChunkSize: number): ChunkValidationResult {
   const errors: string[] = [];
   const warnings: string[] = [];
   const SERVER_ABSOLUTE_MAX_CHUNK_SIZE = 100000; // Example: Absolute server limit, if any (e.g. 100KB)
@@ -479,21 +496,15 @@ function validateChunk(content: string, filePath: string, index: number, configu
     warnings.push("Chunk contains replacement characters (likely encoding issues)");
   }
 
-  const lines = content.split('\n');
-  const nonEmptyLines = lines.filter(line => line.trim().length > 0);
-  const hasCode = nonEmptyLines.some(line =>
-    /^[\s]*[a-zA-Z_$][\w$]*[\s]*[=:({]/.test(line) || 
-    /^[\s]*(import|from|class|def|function|const|let|var)[\s]/.test(line)
-  );
-
-  const language = getLanguageFromPath(filePath);
+  const lineCount = countLines(content);
+  const hasCode = CODE_ASSIGNMENT_PATTERN.test(content) || CODE_KEYWORD_PATTERN.test(content);
 
   return {
     isValid: errors.length === 0,
     errors,
     warnings,
     metadata: {
-      lineCount: lines.length,
+      lineCount,
       characterCount: content.length,
       hasCode,
       language
@@ -502,7 +513,6 @@ function validateChunk(content: string, filePath: string, index: number, configu
 }
 
 function generateChunkHash(content: string, filePath: string, index: number): string {
-  const crypto = require('crypto'); // Standard for Node.js environment in VS Code extensions
   return crypto.createHash('md5')
     .update(`${filePath}:${index}:${content}`)
     .digest('hex');
@@ -512,6 +522,7 @@ function* createChunks(text: string, maxChunkSizeChars: number, filePath: string
   if (!text || text.length === 0) return;
 
   const lines = text.split('\n');
+  const language = getLanguageFromPath(filePath); // Same for every chunk of the file
   let currentChunk = '';
   let chunkIndex = 0;
 
@@ -521,7 +532,7 @@ function* createChunks(text: string, maxChunkSizeChars: number, filePath: string
     if (currentChunk.length + lineWithNewline.length > maxChunkSizeChars) {
       if (currentChunk.length > 0) {
         const content = currentChunk.trimEnd(); // Remove trailing newline if it's the last thing
-        const validation = validateChunk(content, filePath, chunkIndex, maxChunkSizeChars);
+        const validation = validateChunk(content, language, chunkIndex, maxChunkSizeChars);
         yield {
           content,
           index: chunkIndex++,
@@ -534,7 +545,7 @@ function* createChunks(text: string, maxChunkSizeChars: number, filePath: string
       if (lineWithNewline.length > maxChunkSizeChars) {
         for (let i = 0; i < lineWithNewline.length; i += maxChunkSizeChars) {
           const content = lineWithNewline.slice(i, i + maxChunkSizeChars);
-          const validation = validateChunk(content, filePath, chunkIndex, maxChunkSizeChars);
+          const validation = validateChunk(content, language, chunkIndex, maxChunkSizeChars);
           yield {
             content,
             index: chunkIndex++,
@@ -552,7 +563,7 @@ function* createChunks(text: string, maxChunkSizeChars: number, filePath: string
 
   if (currentChunk.length > 0) {
     const content = currentChunk.trimEnd();
-    const validation = validateChunk(content, filePath, chunkIndex, maxChunkSizeChars);
+    const validation = validateChunk(content, language, chunkIndex, maxChunkSizeChars);
     yield {
       content,
       index: chunkIndex,
@@ -562,6 +573,17 @@ function* createChunks(text: string, maxChunkSizeChars: number, filePath: string
   }
 }
 
+// Pulls up to `count` chunks from a chunk generator without draining it
+function takeChunks(iterator: Iterator<ChunkInfo>, count: number): ChunkInfo[] {
+  const batch: ChunkInfo[] = [];
+  while (batch.length < count) {
+    const next = iterator.next();
+    if (next.done) break;
+    batch.push(next.value);
+  }
+  return batch;
+}
+
 // Helper function (not directly used in main indexing flow but can be useful)
 function chunk(text: string, max: number = 1000, filePath: string = ''): ChunkInfo[] {
   return Array.from(createChunks(text, max, filePath));
@@ -583,6 +605,8 @@ let dashboardViewProvider: DashboardWebviewViewProvider;
 
 let globalCancellationController: AbortController | null = null;
 let activeIndexingPromises: Set<Promise<any>> = new Set();
+// Set once the server answers 401 during a run; remaining chunks and files are skipped
+let credentialsRejected = false;
 
 // ─── status dashboard types ────────────────────────────────────────────
 interface DashboardStats {
@@ -593,7 +617,7 @@ interface DashboardStats {
   averageProcessingTime: number;
   activeJobs: number;
   vectorStoreReady: boolean;
-  lastUpdate: string;
+  lastUpdate: number; // Epoch ms; format only where it is displayed
   processingErrors: number;
   webhookStatus: 'connected' | 'disconnected' | 'error';
   collections: string[];
@@ -610,7 +634,8 @@ interface JobMetrics {
 }
 
 // ─── global dashboard state ────────────────────────────────────────────
-let dashboardStats: DashboardStats = {
+// Mutated in place (never reassigned) so the record keeps a single, stable shape
+const dashboardStats: DashboardStats = {
   totalFiles: 0,
   processedFiles: 0,
   totalChunks: 0,
@@ -618,17 +643,26 @@ let dashboardStats: DashboardStats = {
   averageProcessingTime: 0,
   activeJobs: 0,
   vectorStoreReady: false,
-  lastUpdate: new Date().toISOString(),
+  lastUpdate: Date.now(),
   processingErrors: 0,
   webhookStatus: 'disconnected',
   collections: []
 };
 let activeJobMetrics: Map<string, JobMetrics> = new Map();
+// Lifetime count of successful jobs; processedFiles is reset per run and also counts failures
+let successfulJobCount = 0;
 
 // ─── webhook server integration ───────────────────────────────────────
 let webhookServer: any = null;
 let webhookApp: any = null;
 
+// Verbose logging (string-codebase-indexer.debug), cached so hot paths don't read config
+let debugLoggingEnabled = false;
+
+function refreshDebugLogging(): void {
+  debugLoggingEnabled = vscode.workspace.getConfiguration("string-codebase-indexer").get<boolean>("debug", false);
+}
+
 // Generate consistent user ID for the session
 let sessionUserId: string = '';
 
@@ -677,87 +711,30 @@ async function startWebhookServer() {
     
     // Job completion webhook endpoint - following backend documentation format
     webhookApp.post('/webhook/job-complete', (req: any, res: any) => {
-      try {
-        const jobData = req.body;
+      const jobData: unknown = req.body;
+      if (debugLoggingEnabled) {
+        // Pretty-printing the whole payload is only worth it when someone is reading it
         console.log('🎣 Webhook received:', JSON.stringify(jobData, null, 2));
-        
-        // Validate payload structure according to backend docs
-        if (!jobData.job_id || !jobData.status) {
-          console.warn('Invalid webhook payload - missing required fields');
-          return res.status(200).json({ 
-            received: true, 
-            error: 'Invalid payload structure',
-            timestamp: new Date().toISOString() 
-          });
-        }
-        
-        console.log(`[WEBHOOK] Job ${jobData.job_id} ${jobData.status}`);
-        
-        if (jobData.success && jobData.result_data) {
-          // Handle successful job completion according to backend docs
-          const { result_data, metrics } = jobData;
-          
-          console.log(`Processed ${result_data.chunks_processed || 0} chunks in ${metrics?.processing_time_ms || 0}ms`);
-          
-          // Update vector store status if vector storage info is available
-          if (result_data.vector_storage) {
-            const vectorStorage = result_data.vector_storage;
-            
-            updateDashboardStats({
-              vectorStoreReady: vectorStorage.storage_success || false,
-              collections: vectorStorage.collection_name ? 
-                Array.from(new Set([...dashboardStats.collections, vectorStorage.collection_name])) : 
-                dashboardStats.collections
-            });
-            
-            // Show success notification with detailed info
-            vscode.window.showInformationMessage(
-              `✅ Processing complete! ${result_data.chunks_processed || 0} chunks stored in collection: ${vectorStorage.collection_name}`
-            );
-          }
-          
-          // Find and complete the corresponding job using multiple job ID sources
-          const jobId = jobData.job_id || jobData.metadata?.job_id;
-          if (jobId && activeJobMetrics.has(jobId)) {
-            const chunksProcessed = result_data.chunks_processed || 0;
-            const estimatedTokens = Math.round((result_data.file_metadata?.character_count || 0) / 4);
-            
-            completeJob(jobId, true, chunksProcessed, estimatedTokens);
-          }
-          
-        } else {
-          // Handle job failure according to backend docs
-          console.error(`Job failed: ${jobData.error_message || 'Unknown error'}`);
-          
-          updateDashboardStats({ processingErrors: dashboardStats.processingErrors + 1 });
-          
-          vscode.window.showErrorMessage(
-            `❌ Processing failed: ${jobData.error_message || 'Unknown error'}`
-          );
-          
-          // Complete the failed job
-          const jobId = jobData.job_id || jobData.metadata?.job_id;
-          if (jobId && activeJobMetrics.has(jobId)) {
-            completeJob(jobId, false, 0, 0);
-          }
-        }
-        
-        // Always respond with 200 to acknowledge receipt (per backend docs)
-        res.status(200).json({ 
-          received: true, 
-          timestamp: new Date().toISOString(),
-          processed_job_id: jobData.job_id 
-        });
-        
-      } catch (error) {
-        console.error('Webhook processing error:', error);
-        // Always return 200 even for processing errors (per backend docs)
-        res.status(200).json({ 
-          received: true, 
-          error: 'Internal processing error',
-          timestamp: new Date().toISOString() 
-        });
       }
+      
+      // Validate payload structure according to backend docs
+      if (!isJobCompletePayload(jobData)) {
+        console.warn('Invalid webhook payload - missing or mistyped fields');
+        return sendWebhookAck(res, { error: 'Invalid payload structure' });
+      }
+      
+      // Always respond with 200 to acknowledge receipt (per backend docs).
+      // Acknowledge before touching the UI so the server isn't held up by
+      // dashboard re-renders and notifications.
+      sendWebhookAck(res, { processed_job_id: jobData.job_id });
+      
+      setImmediate(() => {
+        try {
+          handleJobCompletion(jobData);
+        } catch (error) {
+          console.error('Webhook processing error:', error);
+        }
+      });
     });
     
     webhookServer = webhookApp.listen(webhookPort, 'localhost', () => {
@@ -793,6 +770,105 @@ async function startWebhookServer() {
   }
 }
 
+// Job completion webhook payload, per SERVER_INTEGRATION.md
+interface JobCompletePayload {
+  job_id: string;
+  status: string;
+  success?: boolean;
+  result_data?: any;
+  metrics?: { processing_time_ms?: number } | null;
+  error_message?: string | null;
+}
+
+function isPlainObject(value: unknown): value is Record<string, unknown> {
+  return typeof value === 'object' && value !== null && !Array.isArray(value);
+}
+
+// Checks every declared field: required ones must be non-empty strings and
+// optional ones, when present and not null, must have the declared type
+function isJobCompletePayload(body: unknown): body is JobCompletePayload {
+  if (!isPlainObject(body)) {
+    return false;
+  }
+  const { job_id, status, success, result_data, metrics, error_message } = body;
+  if (typeof job_id !== 'string' || job_id.length === 0 ||
+      typeof status !== 'string' || status.length === 0) {
+    return false;
+  }
+  if (success !== undefined && typeof success !== 'boolean') {
+    return false;
+  }
+  if (result_data !== undefined && result_data !== null && !isPlainObject(result_data)) {
+    return false;
+  }
+  if (metrics !== undefined && metrics !== null && (!isPlainObject(metrics) ||
+      (metrics.processing_time_ms !== undefined && typeof metrics.processing_time_ms !== 'number'))) {
+    return false;
+  }
+  if (error_message !== undefined && error_message !== null && typeof error_message !== 'string') {
+    return false;
+  }
+  return true;
+}
+
+// Every webhook reply is a 200 acknowledgement (per backend docs); only the extra fields vary
+function sendWebhookAck(res: any, fields: Record<string, unknown> = {}) {
+  return res.status(200).json({ received: true, timestamp: new Date().toISOString(), ...fields });
+}
+
+function handleJobCompletion(jobData: JobCompletePayload) {
+  console.log(`[WEBHOOK] Job ${jobData.job_id} ${jobData.status}`);
+  
+  if (jobData.success && jobData.result_data) {
+    // Handle successful job completion according to backend docs
+    const { result_data, metrics } = jobData;
+    
+    console.log(`Processed ${result_data.chunks_processed || 0} chunks in ${metrics?.processing_time_ms || 0}ms`);
+    
+    // Update vector store status if vector storage info is available
+    if (result_data.vector_storage) {
+      const vectorStorage = result_data.vector_storage;
+      
+      updateDashboardStats({
+        vectorStoreReady: vectorStorage.storage_success || false,
+        collections: vectorStorage.collection_name ? 
+          Array.from(new Set([...dashboardStats.collections, vectorStorage.collection_name])) : 
+          dashboardStats.collections
+      });
+      
+      // Show success notification with detailed info
+      vscode.window.showInformationMessage(
+        `✅ Processing complete! ${result_data.chunks_processed || 0} chunks stored in collection: ${vectorStorage.collection_name}`
+      );
+    }
+    
+    // Find and complete the corresponding job
+    const jobId = jobData.job_id;
+    if (activeJobMetrics.has(jobId)) {
+      const chunksProcessed = result_data.chunks_processed || 0;
+      const estimatedTokens = Math.round((result_data.file_metadata?.character_count || 0) / 4);
+      
+      completeJob(jobId, true, chunksProcessed, estimatedTokens);
+    }
+    
+  } else {
+    // Handle job failure according to backend docs
+    console.error(`Job failed: ${jobData.error_message || 'Unknown error'}`);
+    
+    updateDashboardStats({ processingErrors: dashboardStats.processingErrors + 1 });
+    
+    vscode.window.showErrorMessage(
+      `❌ Processing failed: ${jobData.error_message || 'Unknown error'}`
+    );
+    
+    // Complete the failed job
+    const jobId = jobData.job_id;
+    if (activeJobMetrics.has(jobId)) {
+      completeJob(jobId, false, 0, 0);
+    }
+  }
+}
+
 function stopWebhookServer() {
   if (webhookServer) {
     webhookServer.close(() => {
@@ -806,6 +882,15 @@ function stopWebhookServer() {
 
 // ─── extension entry point ─────────────────────────────────────────────
 export async function activate(context: vscode.ExtensionContext) {
+  refreshDebugLogging();
+  context.subscriptions.push(
+    vscode.workspace.onDidChangeConfiguration(e => {
+      if (e.affectsConfiguration("string-codebase-indexer.debug")) {
+        refreshDebugLogging();
+      }
+    })
+  );
+
   treeDataProvider = new McpTreeDataProvider();
   treeView = vscode.window.createTreeView("mcpCodebaseIndexer", {
     treeDataProvider: treeDataProvider,
@@ -1141,16 +1226,22 @@ async function showFileSelectionDialog(preScannedFiles: FileItem[]) { // Always
 }
 
 // ─── utility functions ─────────────────────────────────────────────────
+// Built once; getLanguageFromPath runs for every scanned file
+const LANGUAGE_BY_EXTENSION: ReadonlyMap<string, string> = new Map([
+  ['py', 'Python'], ['ts', 'TypeScript'], ['tsx', 'TypeScript React'], ['js', 'JavaScript'],
+  ['jsx', 'JavaScript React'], ['java', 'Java'], ['go', 'Go'], ['rs', 'Rust'],
+  ['cpp', 'C++'], ['c', 'C'], ['h', 'C/C++ Header'], ['hpp', 'C++ Header'],
+  ['cs', 'C#'], ['php', 'PHP'], ['rb', 'Ruby']
+  // Add more as needed
+]);
+
+// Extension without the dot, following path.extname rules: a leading dot
+// (".gitignore") or a trailing one ("file.") does not count as an extension
+const FILE_EXTENSION_PATTERN = /[^\\/]\.([^.\\/]+)$/;
+
 function getLanguageFromPath(filePath: string): string {
-  const ext = path.extname(filePath).toLowerCase();
-  const languageMap: { [key: string]: string } = {
-    '.py': 'Python', '.ts': 'TypeScript', '.tsx': 'TypeScript React', '.js': 'JavaScript',
-    '.jsx': 'JavaScript React', '.java': 'Java', '.go': 'Go', '.rs': 'Rust',
-    '.cpp': 'C++', '.c': 'C', '.h': 'C/C++ Header', '.hpp': 'C++ Header',
-    '.cs': 'C#', '.php': 'PHP', '.rb': 'Ruby'
-    // Add more as needed
-  };
-  return languageMap[ext] || path.extname(filePath).substring(1).toUpperCase() || 'Unknown';
+  const ext = FILE_EXTENSION_PATTERN.exec(filePath)?.[1] ?? '';
+  return LANGUAGE_BY_EXTENSION.get(ext.toLowerCase()) || ext.toUpperCase() || 'Unknown';
 }
 
 function formatFileSize(bytes: number): string {
@@ -1221,6 +1312,40 @@ function cleanupIndexingState(): void {
   console.log("🧹 Indexing state has been cleaned up.");
 }
 
+// ─── server health check cache ─────────────────────────────────────────
+// Successful health checks are remembered per server URL + API key so that
+// back-to-back indexing runs skip the extra round trip. Entries are keyed by a
+// SHA-256 digest so the raw API key is never kept around as a map key.
+const HEALTH_CHECK_TTL_MS = 30000;
+const HEALTH_CHECK_CACHE_MAX_ENTRIES = 64;
+const healthCheckCache: Map<string, number> = new Map();
+
+function healthCheckCacheKey(url: string, apiKey: string): string {
+  return crypto.createHash('sha256').update(`${url}\n${apiKey}`).digest('hex');
+}
+
+function isHealthCheckCached(url: string, apiKey: string): boolean {
+  const expiresAt = healthCheckCache.get(healthCheckCacheKey(url, apiKey));
+  return expiresAt !== undefined && expiresAt > Date.now();
+}
+
+function rememberHealthCheck(url: string, apiKey: string): void {
+  const key = healthCheckCacheKey(url, apiKey);
+  healthCheckCache.delete(key); // Re-insert so the entry moves to the back of the FIFO
+  healthCheckCache.set(key, Date.now() + HEALTH_CHECK_TTL_MS);
+  if (healthCheckCache.size > HEALTH_CHECK_CACHE_MAX_ENTRIES) {
+    const oldestKey = healthCheckCache.keys().next().value;
+    if (oldestKey !== undefined) {
+      healthCheckCache.delete(oldestKey);
+    }
+  }
+}
+
+// Called when the server rejects our credentials (401) so the next run re-checks
+function invalidateHealthCheck(url: string, apiKey: string): void {
+  healthCheckCache.delete(healthCheckCacheKey(url, apiKey));
+}
+
 // ─── optimized indexing functions ──────────────────────────────────────
 async function indexSelectedFiles(files: FileItem[]) {
   if (indexingState.isIndexing) {
@@ -1244,34 +1369,45 @@ async function indexSelectedFiles(files: FileItem[]) {
   const apiKey = cfg.get<string>("apiKey") || "";
   const maxChunkSize = cfg.get<number>("maxChunkSize", 1000);
 
+  // Built once per run and shared by the health check and every chunk upload
+  const authHeaders: Record<string, string> = apiKey ? { Authorization: `Bearer ${apiKey}` } : {};
+  const requestHeaders: Record<string, string> = { "Content-Type": "application/json", ...authHeaders };
+
   if (!url) {
     vscode.window.showErrorMessage("Server URL is not configured. Please check extension settings.");
     return;
   }
 
-  try {
-    const fetch = (await import("node-fetch")).default;
-    const healthCheckController = new AbortController();
-    const healthTimeoutId = setTimeout(() => healthCheckController.abort(), 5000); // 5s timeout for health check
-    
-    const response = await fetch(`${url}/health`, { 
-      method: "GET",
-      signal: healthCheckController.signal,
-      headers: apiKey ? { Authorization: `Bearer ${apiKey}` } : {}
-    });
-    clearTimeout(healthTimeoutId);
-    
-    if (!response.ok) {
-      throw new Error(`Server health check failed: ${response.status} ${response.statusText}`);
+  if (isHealthCheckCached(url, apiKey)) {
+    console.log("String Server health check skipped (recently verified).");
+  } else {
+    try {
+      const fetch = (await import("node-fetch")).default;
+      const healthCheckController = new AbortController();
+      const healthTimeoutId = setTimeout(() => healthCheckController.abort(), 5000); // 5s timeout for health check
+      
+      const response = await fetch(`${url}/health`, { 
+        method: "GET",
+        signal: healthCheckController.signal,
+        headers: authHeaders
+      });
+      clearTimeout(healthTimeoutId);
+      
+      if (!response.ok) {
+        throw new Error(`Server health check failed: ${response.status} ${response.statusText}`);
+      }
+      rememberHealthCheck(url, apiKey);
+      console.log("String Server health check successful.");
+    } catch (error) {
+      invalidateHealthCheck(url, apiKey);
+      console.error("String Server health check failed:", error);
+      vscode.window.showErrorMessage(`Cannot connect to server at ${url}. Error: ${error instanceof Error ? error.message : String(error)}. Please check configuration and server status.`);
+      return;
     }
-    console.log("String Server health check successful.");
-  } catch (error) {
-    console.error("String Server health check failed:", error);
-    vscode.window.showErrorMessage(`Cannot connect to server at ${url}. Error: ${error instanceof Error ? error.message : String(error)}. Please check configuration and server status.`);
-    return;
   }
 
   globalCancellationController = new AbortController(); // New controller for this run
+  credentialsRejected = false;
   
   indexingState.isIndexing = true;
   indexingState.totalFiles = files.length;
@@ -1297,7 +1433,7 @@ async function indexSelectedFiles(files: FileItem[]) {
       const BATCH_SIZE = Math.max(1, Math.min(cfg.get<number>("batchSize", 3), 10)); // Ensure 1-10
       
       for (let i = 0; i < files.length; i += BATCH_SIZE) {
-        if (globalCancellationController?.signal.aborted) break;
+        if (globalCancellationController?.signal.aborted || credentialsRejected) break;
 
         const batch = files.slice(i, Math.min(i + BATCH_SIZE, files.length));
         
@@ -1307,7 +1443,7 @@ async function indexSelectedFiles(files: FileItem[]) {
           addJobMetrics(jobId, file.relativePath);
           
           try {
-            const stats = await indexFileOptimized(file.uri, url, apiKey, maxChunkSize, globalCancellationController!.signal, jobId);
+            const stats = await indexFileOptimized(file.uri, url, apiKey, requestHeaders, maxChunkSize, globalCancellationController!.signal, jobId);
             
             // Estimate tokens (rough approximation: 1 token ≈ 4 characters)
             const estimatedTokens = Math.round(stats.totalBytes / 4);
@@ -1342,17 +1478,19 @@ async function indexSelectedFiles(files: FileItem[]) {
           }
         });
 
-        activeIndexingPromises.add(Promise.all(batchPromises));
-        
-        try {
-          await Promise.all(batchPromises);
-        } catch (error) {
-          // Errors are already handled individually above
-        }
+        // Errors are already handled per file above; allSettled never rejects
+        const batchPromise = Promise.allSettled(batchPromises);
+        activeIndexingPromises.add(batchPromise);
+        await batchPromise;
+        // Only in-flight batches are tracked; finished ones (and their results) are released
+        activeIndexingPromises.delete(batchPromise);
       }
 
       const wasCancelled = globalCancellationController?.signal.aborted;
-      if (!wasCancelled) {
+      if (credentialsRejected) {
+        // Not a completed run: leave lastIndexed untouched
+        vscode.window.showErrorMessage("String server rejected the configured API key (401). Remaining files were skipped. Check the string-codebase-indexer.apiKey setting.");
+      } else if (!wasCancelled) {
         indexingState.lastIndexed = new Date();
         const message = errorCount > 0 
           ? `String indexing complete. ✓ ${successCount} files fully/partially indexed, ✗ ${errorCount} files had errors.`
@@ -1373,11 +1511,12 @@ interface ChunkTransmissionResult {
   chunkId?: string;
   processingTimeMs: number;
   error?: string;
+  statusCode?: number;
   retryCount: number;
 }
 
 interface FileIndexingStats {
-  totalChunks: number;
+  totalChunks: number; // Chunks pulled so far; undercounts the file if the run is cancelled or credentials are rejected
   successfulChunks: number;
   failedChunks: number;
   totalBytes: number;
@@ -1385,39 +1524,51 @@ interface FileIndexingStats {
   errors: string[];
 }
 
-async function sendChunkWithRetry(
-  chunkInfo: ChunkInfo,
-  filePathRelative: string, // Use relative path for payload
-  url: string,
-  headers: Record<string, string>,
-  abortSignal: AbortSignal,
-  jobId: string // Add jobId parameter for tracking
-): Promise<ChunkTransmissionResult> {
-  const maxRetries = 3;
-  let retryCount = 0;
-  const endpoint = `${url}/index/chunk`;
+// Payload fields that are the same for every chunk of a file, resolved once per file
+interface FilePayloadContext {
+  filePathRelative: string; // Use relative path for payload
+  jobId: string;
+  userId: string;
+  workspaceId: string;
+  webhookUrl?: string;
+}
 
+function createFilePayloadContext(filePathRelative: string, jobId: string): FilePayloadContext {
   // Get webhook configuration
   const config = vscode.workspace.getConfiguration("string-codebase-indexer");
   const webhookEnabled = config.get<boolean>("enableWebhooks", true);
   const webhookPort = config.get<number>("webhookPort", 3000);
-  
+
+  return {
+    filePathRelative,
+    jobId,
+    userId: getOrCreateUserId(),
+    workspaceId: vscode.workspace.name || 'default',
+    webhookUrl: webhookEnabled ? `http://localhost:${webhookPort}/webhook/job-complete` : undefined
+  };
+}
+
+function buildChunkPayload(
+  chunkInfo: ChunkInfo,
+  fileContext: FilePayloadContext,
+  timestamp: string // Shared by every chunk in the same request
+) {
   // Construct payload following backend documentation format
-  const payload = {
+  return {
     job_type: "file_processing",
-    user_id: getOrCreateUserId(),
+    user_id: fileContext.userId,
     metadata: {
-      file_path: filePathRelative,
+      file_path: fileContext.filePathRelative,
       chunk_index: chunkInfo.index,
       content_length: chunkInfo.content.length,
       hash: chunkInfo.hash,
-      timestamp: new Date().toISOString(),
+      timestamp,
       source: "vscode-extension",
       extension_version: "0.0.4",
-      workspace_id: vscode.workspace.name || 'default',
-      job_id: jobId, // Include job ID for correlation
-      ...(webhookEnabled ? { 
-        webhook_url: `http://localhost:${webhookPort}/webhook/job-complete`
+      workspace_id: fileContext.workspaceId,
+      job_id: fileContext.jobId, // Include job ID for correlation
+      ...(fileContext.webhookUrl ? { 
+        webhook_url: fileContext.webhookUrl
       } : {})
     },
     // Include chunk content and metadata in the format expected by the backend
@@ -1428,10 +1579,50 @@ async function sendChunkWithRetry(
       hash: chunkInfo.hash
     }
   };
+}
+
+async function sendChunkWithRetry(
+  chunkInfo: ChunkInfo,
+  fileContext: FilePayloadContext,
+  url: string,
+  headers: Record<string, string>,
+  abortSignal: AbortSignal
+): Promise<ChunkTransmissionResult> {
+  const payload = buildChunkPayload(chunkInfo, fileContext, new Date().toISOString());
+  return postWithRetry(`${url}/index/chunk`, payload, headers, abortSignal, fileContext.jobId);
+}
+
+// Sends several chunks of the same file in one request to the bulk endpoint
+async function sendChunkBatchWithRetry(
+  chunkInfos: ChunkInfo[],
+  fileContext: FilePayloadContext,
+  url: string,
+  headers: Record<string, string>,
+  abortSignal: AbortSignal
+): Promise<ChunkTransmissionResult> {
+  const timestamp = new Date().toISOString();
+  const payload = {
+    chunks: chunkInfos.map(chunkInfo => buildChunkPayload(chunkInfo, fileContext, timestamp))
+  };
+  return postWithRetry(`${url}/index/chunks`, payload, headers, abortSignal, fileContext.jobId);
+}
+
+async function postWithRetry(
+  endpoint: string,
+  payload: object,
+  headers: Record<string, string>,
+  abortSignal: AbortSignal,
+  jobId: string
+): Promise<ChunkTransmissionResult> {
+  const maxRetries = 3;
+  let retryCount = 0;
+
+  // Serialize once up front; retries resend the same body
+  const body = JSON.stringify(payload);
 
   while (retryCount <= maxRetries) { // Allow initial attempt + maxRetries
     if (abortSignal.aborted) {
-      // console.debug(`sendChunkWithRetry: Abort signal received for chunk ${chunkInfo.index} of ${filePathRelative}`);
+      // console.debug(`postWithRetry: Abort signal received for ${endpoint}`);
       throw new Error("Indexing operation cancelled by user."); // AbortError is often used
     }
 
@@ -1447,7 +1638,7 @@ async function sendChunkWithRetry(
       const response = await fetch(endpoint, {
         method: "POST",
         headers,
-        body: JSON.stringify(payload),
+        body,
         signal: combinedSignal,
       });
 
@@ -1456,19 +1647,19 @@ async function sendChunkWithRetry(
 
       if (!response.ok) {
         const errorText = await response.text().catch(() => 'Failed to read error response');
-        // console.warn(`Chunk ${chunkInfo.index} of ${filePathRelative} - Server error ${response.status}: ${errorText}`);
+        // console.warn(`${endpoint} - Server error ${response.status}: ${errorText}`);
         // Retry on 5xx errors, fail immediately on 4xx (unless specific 4xx are retryable)
         if (response.status >= 500 && retryCount < maxRetries) {
             throw new Error(`Server error ${response.status}: ${errorText} (will retry)`);
         }
-        return { success: false, error: `Server error ${response.status}: ${errorText}`, retryCount, processingTimeMs };
+        return { success: false, error: `Server error ${response.status}: ${errorText}`, statusCode: response.status, retryCount, processingTimeMs };
       }
 
       let responseData: any = {};
       try { 
         responseData = await response.json(); 
         // Extract job_id from response if available - server may assign different ID
-        if (responseData.job_id && responseData.job_id !== jobId) {
+        if (debugLoggingEnabled && responseData.job_id && responseData.job_id !== jobId) {
           console.log(`Server assigned job ID: ${responseData.job_id} for our job: ${jobId}`);
         }
       } catch (e) { /* Non-JSON response is ok */ }
@@ -1477,20 +1668,20 @@ async function sendChunkWithRetry(
 
     } catch (error: any) {
       const processingTimeMs = Date.now() - attemptStartTime;
-      // console.debug(`sendChunkWithRetry: Attempt ${retryCount} for chunk ${chunkInfo.index} of ${filePathRelative} failed: ${error.message}`);
+      // console.debug(`postWithRetry: Attempt ${retryCount} for ${endpoint} failed: ${error.message}`);
       if (abortSignal.aborted || error.name === 'AbortError') { // Check if it was an abort
-        // console.log(`sendChunkWithRetry: Aborted during attempt ${retryCount} for chunk ${chunkInfo.index} of ${filePathRelative}`);
+        // console.log(`postWithRetry: Aborted during attempt ${retryCount} for ${endpoint}`);
         throw error; // Re-throw AbortError to be caught by caller
       }
 
       retryCount++;
       if (retryCount > maxRetries) {
-        // console.error(`Chunk ${chunkInfo.index} of ${filePathRelative} - Failed after ${maxRetries} retries: ${error.message}`);
+        // console.error(`${endpoint} - Failed after ${maxRetries} retries: ${error.message}`);
         return { success: false, error: `Failed after ${maxRetries} retries: ${error.message}`, retryCount, processingTimeMs };
       }
       
       const delay = Math.pow(2, retryCount -1) * 1000 + Math.random() * 500; // Exponential backoff with jitter
-      // console.log(`Chunk ${chunkInfo.index} of ${filePathRelative} - Retrying attempt ${retryCount}/${maxRetries} in ${delay.toFixed(0)}ms...`);
+      // console.log(`${endpoint} - Retrying attempt ${retryCount}/${maxRetries} in ${delay.toFixed(0)}ms...`);
       await new Promise(resolve => setTimeout(resolve, delay));
     }
   }
@@ -1515,7 +1706,8 @@ function anySignal(...signals: AbortSignal[]): AbortSignal {
 async function indexFileOptimized(
   uri: vscode.Uri,
   url: string,
-  apiKey: string,
+  apiKey: string, // Only used to invalidate the cached health check on 401/403
+  headers: Record<string, string>,
   maxChunkSizeChars: number,
   abortSignal: AbortSignal, // Use this signal
   jobId: string
@@ -1545,22 +1737,14 @@ async function indexFileOptimized(
     return stats; // No chunks to process
   }
 
-  const headers = {
-    "Content-Type": "application/json",
-    ...(apiKey ? { Authorization: `Bearer ${apiKey}` } : {}),
-  };
-
   // Get relative path for payload
   const workspaceFolder = vscode.workspace.getWorkspaceFolder(uri);
   const relativePath = workspaceFolder ? path.relative(workspaceFolder.uri.fsPath, uri.fsPath) : path.basename(uri.fsPath);
+  const fileContext = createFilePayloadContext(relativePath, jobId);
 
-  const chunks = Array.from(createChunks(fileContent, maxChunkSizeChars, uri.fsPath)); // uri.fsPath for validation context
-  stats.totalChunks = chunks.length;
-
-  if (stats.totalChunks === 0 && stats.totalBytes > 0) {
-      // console.warn(`File ${relativePath} has content but generated 0 chunks.`);
-      // This might indicate an issue with chunking logic for certain small files.
-  }
+  // Chunks are pulled from the generator one batch at a time so a large file
+  // never has all of its chunk payloads materialized at once
+  const chunkIterator = createChunks(fileContent, maxChunkSizeChars, uri.fsPath); // uri.fsPath for validation context
 
   // Initialize job metrics with estimated tokens
   const estimatedTokens = Math.round(stats.totalBytes / 4);
@@ -1572,50 +1756,69 @@ async function indexFileOptimized(
 
   const config = vscode.workspace.getConfiguration("string-codebase-indexer");
   const concurrencyLimit = config.get<number>("batchSize", 3) > 3 ? 2 : 1; // Limit concurrent chunk requests per file, related to overall batchSize
+  // Chunks coalesced into a single POST to /index/chunks (1 keeps the per-chunk /index/chunk endpoint)
+  const chunksPerRequest = Math.max(1, Math.min(config.get<number>("chunksPerRequest", 1), 50));
   
-  for (let i = 0; i < chunks.length; i += concurrencyLimit) {
+  let chunkBatch = takeChunks(chunkIterator, concurrencyLimit * chunksPerRequest);
+  while (chunkBatch.length > 0) {
     if (abortSignal.aborted) {
       // console.debug(`indexFileOptimized: Abort signal received before processing chunk batch for ${relativePath}`);
       stats.errors.push("Operation cancelled");
       break; 
     }
 
-    const chunkBatch = chunks.slice(i, Math.min(i + concurrencyLimit, chunks.length));
-    const batchPromises = chunkBatch.map(async (chunkInfo) => {
-      if (abortSignal.aborted) return; // Check before each chunk send
+    stats.totalChunks += chunkBatch.length;
+    const requestGroups: ChunkInfo[][] = [];
+    for (let j = 0; j < chunkBatch.length; j += chunksPerRequest) {
+      requestGroups.push(chunkBatch.slice(j, j + chunksPerRequest));
+    }
+
+    const batchPromises = requestGroups.map(async (group) => {
+      if (abortSignal.aborted) return; // Check before each request
+      const label = group.length === 1
+        ? `Chunk ${group[0].index}`
+        : `Chunks ${group[0].index}-${group[group.length - 1].index}`;
 
       try {
-        const result = await sendChunkWithRetry(chunkInfo, relativePath, url, headers, abortSignal, jobId);
+        const result = chunksPerRequest > 1
+          ? await sendChunkBatchWithRetry(group, fileContext, url, headers, abortSignal)
+          : await sendChunkWithRetry(group[0], fileContext, url, headers, abortSignal);
         if (result.success) {
-          stats.successfulChunks++;
+          stats.successfulChunks += group.length;
           // Update job metrics with progress
           updateJobMetrics(jobId, {
             chunksProcessed: stats.successfulChunks,
             processingTimeMs: Date.now() - startTime
           });
-          // console.debug(`✓ Chunk ${chunkInfo.index} of ${relativePath} sent (${result.processingTimeMs}ms). ID: ${result.chunkId || 'N/A'}`);
+          // console.debug(`✓ ${label} of ${relativePath} sent (${result.processingTimeMs}ms). ID: ${result.chunkId || 'N/A'}`);
         } else {
-          stats.failedChunks++;
-          stats.errors.push(`Chunk ${chunkInfo.index}: ${result.error || 'Unknown send error'}`);
-          // console.warn(`✗ Chunk ${chunkInfo.index} of ${relativePath} failed after ${result.retryCount} retries: ${result.error}`);
+          // Only 401 means a bad key; a 403 may be a forbidden path and is handled like any other error
+          if (result.statusCode === 401) {
+            credentialsRejected = true;
+            invalidateHealthCheck(url, apiKey);
+          }
+          stats.failedChunks += group.length;
+          stats.errors.push(`${label}: ${result.error || 'Unknown send error'}`);
+          // console.warn(`✗ ${label} of ${relativePath} failed after ${result.retryCount} retries: ${result.error}`);
         }
-      } catch (error: any) { // Catch errors from sendChunkWithRetry, especially AbortError
+      } catch (error: any) { // Catch errors from the send helpers, especially AbortError
         if (error.name === 'AbortError' || abortSignal.aborted) {
-            // console.log(`Chunk ${chunkInfo.index} of ${relativePath} processing aborted.`);
+            // console.log(`${label} of ${relativePath} processing aborted.`);
             // This error will be added to stats.errors by the outer loop's break if needed
             return; // Don't count as failed if aborted
         }
-        stats.failedChunks++;
-        stats.errors.push(`Chunk ${chunkInfo.index} critical error: ${error.message}`);
-        // console.error(`✗ Chunk ${chunkInfo.index} of ${relativePath} had critical error: ${error.message}`);
+        stats.failedChunks += group.length;
+        stats.errors.push(`${label} critical error: ${error.message}`);
+        // console.error(`✗ ${label} of ${relativePath} had critical error: ${error.message}`);
       }
     });
 
     await Promise.allSettled(batchPromises);
-    if (abortSignal.aborted) break; // Check after batch processing
+    if (abortSignal.aborted || credentialsRejected) break; // Check after batch processing
 
     // Small delay between chunk batches for the same file, if not already rate-limited by server
-    if (i + concurrencyLimit < chunks.length) {
+    chunkBatch = takeChunks(chunkIterator, concurrencyLimit * chunksPerRequest);
+    if (chunkBatch.length > 0) {
       await new Promise(resolve => setTimeout(resolve, 50)); // 50ms delay
     }
   }
@@ -1624,6 +1827,11 @@ async function indexFileOptimized(
       stats.errors.push("Operation cancelled during chunk processing");
   }
 
+  if (credentialsRejected) {
+    // The run stopped mid-file; report this file as failed rather than partially indexed
+    throw new Error("Server rejected the configured API key (401)");
+  }
+
   stats.processingTimeMs = Date.now() - startTime;
   return stats;
 }
@@ -1689,12 +1897,9 @@ function updateDashboardContent() {
 
 
 function updateDashboardStats(update: Partial<DashboardStats>) {
-  dashboardStats = { ...dashboardStats, ...update, lastUpdate: new Date().toISOString() };
+  Object.assign(dashboardStats, update);
+  dashboardStats.lastUpdate = Date.now();
   updateDashboardContent();
-  // Also update the embedded dashboard view
-  if (dashboardViewProvider) {
-    dashboardViewProvider.updateContent();
-  }
 }
 
 function addJobMetrics(jobId: string, fileName: string) {
@@ -1715,7 +1920,8 @@ function addJobMetrics(jobId: string, fileName: string) {
 function updateJobMetrics(jobId: string, update: Partial<JobMetrics>) {
   const existing = activeJobMetrics.get(jobId);
   if (existing) {
-    activeJobMetrics.set(jobId, { ...existing, ...update });
+    // Update in place: this runs once per uploaded chunk, so avoid copying the record each time
+    Object.assign(existing, update);
     updateDashboardContent();
   }
 }
@@ -1738,9 +1944,9 @@ function completeJob(jobId: string, success: boolean, chunksProcessed: number =
     dashboardStats.totalTokens += tokensGenerated;
     
     if (success) {
-      dashboardStats.averageProcessingTime = 
-        (dashboardStats.averageProcessingTime * (dashboardStats.processedFiles - 1) + processingTime / 1000) / 
-        dashboardStats.processedFiles;
+      successfulJobCount++;
+      dashboardStats.averageProcessingTime += 
+        (processingTime / 1000 - dashboardStats.averageProcessingTime) / successfulJobCount;
     } else {
       dashboardStats.processingErrors++;
     }
@@ -1754,53 +1960,8 @@ function completeJob(jobId: string, success: boolean, chunksProcessed: number =
 }
 
 // ─── status dashboard webview view provider ─────────────────────────────
-class DashboardWebviewViewProvider implements vscode.WebviewViewProvider {
-  public static readonly viewType = 'mcpStatusDashboardView';
-  private _view?: vscode.WebviewView;
-
-  constructor(private readonly _extensionUri: vscode.Uri) {}
-
-  public resolveWebviewView(
-    webviewView: vscode.WebviewView,
-    context: vscode.WebviewViewResolveContext,
-    _token: vscode.CancellationToken,
-  ) {
-    this._view = webviewView;
-
-    webviewView.webview.options = {
-      enableScripts: true,
-      localResourceRoots: [this._extensionUri]
-    };
-
-    this.updateContent();
-
-    // Listen for messages from the webview
-    webviewView.webview.onDidReceiveMessage(data => {
-      switch (data.type) {
-        case 'refresh':
-          this.updateContent();
-          break;
-      }
-    });
-  }
-
-  public updateContent() {
-    if (this._view) {
-      this._view.webview.html = this.generateCompactDashboardHTML();
-    }
-  }
-
-  private generateCompactDashboardHTML(): string {
-    const stats = dashboardStats;
-    const activeJobs = Array.from(activeJobMetrics.values());
-    
-    return `<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>String Status</title>
-    <style>
+// Static stylesheet for the dashboard; only the body markup is rebuilt on each render
+const DASHBOARD_STYLES = `
         body {
             font-family: var(--vscode-font-family);
             font-size: var(--vscode-font-size);
@@ -1830,10 +1991,9 @@ class DashboardWebviewViewProvider implements vscode.WebviewViewProvider {
             width: 8px;
             height: 8px;
             border-radius: 50%;
-            animation: ${stats.vectorStoreReady ? 'pulse 2s infinite' : 'none'};
         }
         
-        .status-ready { background: #28a745; }
+        .status-ready { background: #28a745; animation: pulse 2s infinite; }
         .status-processing { background: #ffc107; }
         .status-error { background: #dc3545; }
         
@@ -1886,9 +2046,12 @@ class DashboardWebviewViewProvider implements vscode.WebviewViewProvider {
             width: 8px;
             height: 8px;
             border-radius: 50%;
-            background: ${stats.webhookStatus === 'connected' ? '#28a745' : stats.webhookStatus === 'error' ? '#dc3545' : '#6c757d'};
+            background: #6c757d;
         }
         
+        .webhook-connected { background: #28a745; }
+        .webhook-error { background: #dc3545; }
+        
         .section {
             margin-bottom: 12px;
         }
@@ -2012,9 +2175,67 @@ class DashboardWebviewViewProvider implements vscode.WebviewViewProvider {
             height: 100%;
             background: var(--vscode-progressBar-foreground);
             transition: width 0.3s ease;
-            width: ${stats.totalFiles > 0 ? (stats.processedFiles / stats.totalFiles) * 100 : 0}%;
         }
-    </style>
+`;
+
+// Dashboard updates arrive in bursts (one per uploaded chunk); renders within this window are coalesced
+const DASHBOARD_RENDER_DELAY_MS = 100;
+
+class DashboardWebviewViewProvider implements vscode.WebviewViewProvider {
+  public static readonly viewType = 'mcpStatusDashboardView';
+  private _view?: vscode.WebviewView;
+  private _renderScheduled = false;
+
+  constructor(private readonly _extensionUri: vscode.Uri) {}
+
+  public resolveWebviewView(
+    webviewView: vscode.WebviewView,
+    context: vscode.WebviewViewResolveContext,
+    _token: vscode.CancellationToken,
+  ) {
+    this._view = webviewView;
+
+    webviewView.webview.options = {
+      enableScripts: true,
+      localResourceRoots: [this._extensionUri]
+    };
+
+    this.updateContent();
+
+    // Listen for messages from the webview
+    webviewView.webview.onDidReceiveMessage(data => {
+      switch (data.type) {
+        case 'refresh':
+          this.updateContent();
+          break;
+      }
+    });
+  }
+
+  public updateContent() {
+    if (!this._view || this._renderScheduled) {
+      return;
+    }
+    this._renderScheduled = true;
+    setTimeout(() => {
+      this._renderScheduled = false;
+      if (this._view) {
+        this._view.webview.html = this.generateCompactDashboardHTML();
+      }
+    }, DASHBOARD_RENDER_DELAY_MS);
+  }
+
+  private generateCompactDashboardHTML(): string {
+    const stats = dashboardStats;
+    const activeJobs = Array.from(activeJobMetrics.values());
+    
+    return `<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>String Status</title>
+    <style>${DASHBOARD_STYLES}    </style>
 </head>
 <body>
     <div class="header">
@@ -2023,7 +2244,7 @@ class DashboardWebviewViewProvider implements vscode.WebviewViewProvider {
     </div>
     
     <div class="webhook-status">
-        <div class="webhook-icon"></div>
+        <div class="webhook-icon webhook-${stats.webhookStatus}"></div>
         <span>Webhook: ${stats.webhookStatus === 'connected' ? '🟢' : stats.webhookStatus === 'error' ? '🔴' : '🟡'}</span>
     </div>
     
@@ -2032,7 +2253,7 @@ class DashboardWebviewViewProvider implements vscode.WebviewViewProvider {
             <span class="stat-value">${stats.totalFiles}</span>
             <span class="stat-label">Total</span>
             <div class="progress-bar">
-                <div class="progress-fill"></div>
+                <div class="progress-fill" style="width: ${stats.totalFiles > 0 ? (stats.processedFiles / stats.totalFiles) * 100 : 0}%"></div>
             </div>
         </div>
         